@@ -9,17 +9,24 @@ License: MIT
 """
 
 import os
-import json
 import asyncio
 import logging
-import threading
+import sqlite3
 from datetime import time as dtime
-from typing import Set
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib decoder
+    import json
+
+    orjson = None
 from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from langchain_groq import ChatGroq
+from langchain.globals import set_llm_cache
 from langchain.schema import HumanMessage
 
 from telegram.ext import (
@@ -28,9 +35,15 @@ from telegram.ext import (
     CallbackQueryHandler,
     ContextTypes,
 )
+from telegram.error import TelegramError
 import themes
+import llm_cache
+import broadcast
 from . import quiz
-from quiz import build_quiz_message, handle_quiz_selection
+
+if TYPE_CHECKING:
+    import telegram
+    import telegram.ext
 
 # ------------------------------
 # Configuration and Constants
@@ -52,9 +65,37 @@ TELEGRAM_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "").strip()
 DAILY_SEND_TIME = os.getenv("DAILY_SEND_TIME", "09:00").strip()  # "HH:MM"
 
-# File paths and synchronization
-SUBSCRIBERS_FILE = os.path.join(os.path.dirname(__file__), "..", "subscribers.json")
-_SUB_LOCK = threading.Lock()
+# Semantic response cache shared by every LLM call in this process
+# (plain and themed facts); repeated prompts are served from local SQLite.
+set_llm_cache(llm_cache.SemanticLLMCache())
+
+# File paths
+SUBSCRIBERS_DB = os.path.join(os.path.dirname(__file__), "..", "subscribers.db")
+LEGACY_SUBSCRIBERS_FILE = os.path.join(os.path.dirname(__file__), "..", "subscribers.json")
+
+FACT_PROMPT = (
+    "Provide a fascinating and accurate Ethiopian history fact in 2-3 sentences. "
+    "Focus on interesting events, cultural aspects, or historical figures. "
+    "Make it engaging and educational."
+)
+# Built once so every call sends byte-identical messages (stable cache keys)
+_FACT_MSGS = [HumanMessage(content=FACT_PROMPT)]
+
+# /fact reply header; streamed replies are edited at most once per interval
+_FACT_HEADER = "📚 **Ethiopian History Fact:**\n\n"
+STREAM_EDIT_INTERVAL = 1.0  # seconds
+
+# Daily broadcast message template for non-themed subscribers
+_GENERIC_PREFIX = "🌅 **Daily Ethiopian History Fact**\n\n"
+_GENERIC_SUFFIX = "\n\n🇪🇹 Have a great day!"
+
+# Pre-generated facts served instantly by /fact (filled in the background)
+FACT_POOL_SIZE = 10
+FACT_POOL_REFILL_INTERVAL = 60.0  # seconds between background generations
+FACT_FALLBACK = "I apologize, but I'm having trouble generating a history fact right now. Please try again later."
+_FACT_POOL: Optional["asyncio.Queue[str]"] = None
+
+TELEGRAM_POOL_SIZE = 32  # connections shared by all Bot API requests
 
 
 def _require_env_vars() -> None:
@@ -68,33 +109,69 @@ def _require_env_vars() -> None:
     logger.info("Environment variables validated successfully")
 
 
-def _load_subscribers() -> Set[int]:
-    """Load subscriber chat IDs from JSON file."""
-    with _SUB_LOCK:
-        try:
-            if not os.path.exists(SUBSCRIBERS_FILE):
-                logger.info("No subscribers file found, starting with empty set")
-                return set()
-            with open(SUBSCRIBERS_FILE, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-            subscribers = set(int(x) for x in data.get("subscribers", []))
-            logger.info(f"Loaded {len(subscribers)} subscribers")
-            return subscribers
-        except Exception as e:
-            logger.exception("Failed to load subscribers.json; starting with empty set.")
-            return set()
-
-
-def _save_subscribers(subs: Set[int]) -> None:
-    """Save subscriber chat IDs to JSON file."""
-    with _SUB_LOCK:
+def _open_subscribers_db() -> sqlite3.Connection:
+    """Open the subscribers database, importing a legacy subscribers.json once."""
+    os.makedirs(os.path.dirname(SUBSCRIBERS_DB), exist_ok=True)
+    conn = sqlite3.connect(SUBSCRIBERS_DB, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS subscribers (chat_id INTEGER PRIMARY KEY)")
+
+    if os.path.exists(LEGACY_SUBSCRIBERS_FILE):
         try:
-            os.makedirs(os.path.dirname(SUBSCRIBERS_FILE), exist_ok=True)
-            with open(SUBSCRIBERS_FILE, "w", encoding="utf-8") as fh:
-                json.dump({"subscribers": list(subs)}, fh, indent=2)
-            logger.info(f"Saved {len(subs)} subscribers to file")
-        except Exception as e:
-            logger.exception("Failed to save subscribers to file")
+            with open(LEGACY_SUBSCRIBERS_FILE, "rb") as fh:
+                raw = fh.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            conn.executemany(
+                "INSERT OR IGNORE INTO subscribers (chat_id) VALUES (?)",
+                ((int(x),) for x in data.get("subscribers", [])),
+            )
+            os.replace(LEGACY_SUBSCRIBERS_FILE, LEGACY_SUBSCRIBERS_FILE + ".migrated")
+            logger.info("Migrated subscribers.json into subscribers.db")
+        except Exception:
+            logger.exception("Failed to migrate subscribers.json; leaving it in place")
+    return conn
+
+
+_SUB_DB = _open_subscribers_db()
+_SUB_LOCK = asyncio.Lock()
+
+
+def _sub_execute(sql: str, params: tuple) -> Tuple[List[tuple], int]:
+    cur = _SUB_DB.execute(sql, params)
+    return cur.fetchall(), cur.rowcount
+
+
+async def _sub_query(sql: str, params: tuple = ()) -> Tuple[List[tuple], int]:
+    """Run a subscribers query in a worker thread so disk I/O never blocks the loop.
+
+    Returns (rows, rowcount).
+    """
+    async with _SUB_LOCK:
+        return await asyncio.to_thread(_sub_execute, sql, params)
+
+
+async def _load_subscribers() -> Set[int]:
+    """Load subscriber chat IDs from the database."""
+    try:
+        rows, _ = await _sub_query("SELECT chat_id FROM subscribers")
+        subscribers = {row[0] for row in rows}
+        logger.info(f"Loaded {len(subscribers)} subscribers")
+        return subscribers
+    except Exception as e:
+        logger.exception("Failed to load subscribers; starting with empty set.")
+        return set()
+
+
+async def add_subscriber(chat_id: int) -> bool:
+    """Subscribe a chat. Returns False if it was already subscribed."""
+    _, changed = await _sub_query("INSERT OR IGNORE INTO subscribers (chat_id) VALUES (?)", (chat_id,))
+    return changed > 0
+
+
+async def remove_subscriber(chat_id: int) -> bool:
+    """Unsubscribe a chat. Returns False if it was not subscribed."""
+    _, changed = await _sub_query("DELETE FROM subscribers WHERE chat_id = ?", (chat_id,))
+    return changed > 0
 
 
 async def start_command(update: "telegram.Update", context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -102,16 +179,13 @@ async def start_command(update: "telegram.Update", context: ContextTypes.DEFAULT
     chat_id = update.effective_chat.id
     user_name = update.effective_user.first_name or "User"
     
-    subs = _load_subscribers()
-    if chat_id in subs:
+    if not await add_subscriber(chat_id):
         await update.message.reply_text(
             "You are already subscribed to daily Ethiopian history facts! 📚"
         )
         logger.info(f"User {user_name} (ID: {chat_id}) attempted to subscribe but was already subscribed")
         return
     
-    subs.add(chat_id)
-    _save_subscribers(subs)
     await update.message.reply_text(
         "Subscribed ✅ You will receive one short Ethiopian history fact daily at 9:00 AM! 🇪🇹"
     )
@@ -123,14 +197,11 @@ async def stop_command(update: "telegram.Update", context: ContextTypes.DEFAULT_
     chat_id = update.effective_chat.id
     user_name = update.effective_user.first_name or "User"
     
-    subs = _load_subscribers()
-    if chat_id not in subs:
+    if not await remove_subscriber(chat_id):
         await update.message.reply_text("You are not subscribed to daily facts.")
         logger.info(f"User {user_name} (ID: {chat_id}) attempted to unsubscribe but was not subscribed")
         return
     
-    subs.remove(chat_id)
-    _save_subscribers(subs)
     await update.message.reply_text("Unsubscribed ✅ You will no longer receive daily facts.")
     logger.info(f"User {user_name} (ID: {chat_id}) successfully unsubscribed")
 
@@ -140,16 +211,100 @@ async def fact_command(update: "telegram.Update", context: ContextTypes.DEFAULT_
     user_name = update.effective_user.first_name or "User"
     logger.info(f"User {user_name} requested an instant fact")
     
+    message = None
     try:
-        await update.message.reply_text("Generating a fascinating Ethiopian history fact... 🤔")
-        fact = await asyncio.to_thread(_generate_fact_sync)
-        await update.message.reply_text(f"📚 **Ethiopian History Fact:**\n\n{fact}")
+        if _FACT_POOL is not None and not _FACT_POOL.empty():
+            fact = _FACT_POOL.get_nowait()
+            await update.message.reply_text(f"{_FACT_HEADER}{fact}")
+        else:
+            message = await update.message.reply_text("Generating a fascinating Ethiopian history fact... 🤔")
+            fact = await _stream_fact(message)
+            await message.edit_text(f"{_FACT_HEADER}{fact or FACT_FALLBACK}")
         logger.info(f"Successfully generated fact for user {user_name}")
     except Exception as exc:
         logger.exception("Failed to generate fact on-demand")
+        if message is not None:
+            # Replace the half-streamed placeholder rather than leaving it behind
+            await message.edit_text(FACT_FALLBACK)
+        else:
+            await update.message.reply_text(
+                "Sorry, I couldn't generate a fact right now. Please try again later! 😔"
+            )
+
+
+async def _theme_status(update: "telegram.Update", args: List[str]) -> None:
+    """Show theme subscription status (overview when called without args)."""
+    status = "subscribed" if themes.is_subscribed(update.effective_chat.id) else "not subscribed"
+    if not args:
+        _, current_theme = themes.get_current_theme()
         await update.message.reply_text(
-            "Sorry, I couldn't generate a fact right now. Please try again later! 😔"
+            "Weekly Themed Series: "
+            f"You are currently {status}.\n"
+            "Use /theme on to subscribe or /theme off to unsubscribe.\n"
+            f"Current theme: {current_theme or 'TBD'}"
         )
+        return
+    wk, current_theme = themes.get_current_theme()
+    await update.message.reply_text(
+        f"You are {status}. Current week: {wk or 'TBD'}, Theme: {current_theme or 'TBD'}."
+    )
+
+
+async def _theme_on(update: "telegram.Update", args: List[str]) -> None:
+    """Subscribe the chat to the Weekly Themed Series."""
+    chat_id = update.effective_chat.id
+    user_name = update.effective_user.first_name or "User"
+    if themes.subscribe(chat_id):
+        await update.message.reply_text("Subscribed to Weekly Themed Series ✅")
+        logger.info(f"User {user_name} (ID: {chat_id}) subscribed to themes")
+    else:
+        await update.message.reply_text("You are already subscribed to themes.")
+
+
+async def _theme_off(update: "telegram.Update", args: List[str]) -> None:
+    """Unsubscribe the chat from the Weekly Themed Series."""
+    chat_id = update.effective_chat.id
+    user_name = update.effective_user.first_name or "User"
+    if themes.unsubscribe(chat_id):
+        await update.message.reply_text("Unsubscribed from Weekly Themed Series ✅")
+        logger.info(f"User {user_name} (ID: {chat_id}) unsubscribed from themes")
+    else:
+        await update.message.reply_text("You were not subscribed to themes.")
+
+
+async def _theme_set(update: "telegram.Update", args: List[str]) -> None:
+    """Admin-only: override the current week's theme."""
+    chat_id = update.effective_chat.id
+    # Optional admin override using comma-separated IDs in THEME_ADMIN_IDS
+    admin_ids_str = os.getenv("THEME_ADMIN_IDS", "").strip()
+    admin_ids = {int(x) for x in admin_ids_str.split(",") if x.strip().isdigit()} if admin_ids_str else set()
+    if chat_id not in admin_ids:
+        await update.message.reply_text("You are not authorized to set the theme.")
+        return
+    if len(args) < 2:
+        await update.message.reply_text("Usage: /theme set <theme name>")
+        return
+    manual_theme = " ".join(args[1:]).strip()
+    wk, th = themes.ensure_current_week_theme(admin_override=manual_theme)
+    await update.message.reply_text(f"Set weekly theme to '{th}' for week {wk} ✅")
+    logger.info(f"Admin {chat_id} set weekly theme to '{th}' for {wk}")
+
+
+async def _theme_unknown(update: "telegram.Update", args: List[str]) -> None:
+    """Reply with usage for an unrecognised action."""
+    await update.message.reply_text("Unknown action. Use /theme on|off|status or /theme set <name>.")
+
+
+# /theme sub-commands; no argument shows the status overview
+_THEME_ACTIONS = {
+    None: _theme_status,
+    "status": _theme_status,
+    "on": _theme_on,
+    "subscribe": _theme_on,
+    "off": _theme_off,
+    "unsubscribe": _theme_off,
+    "set": _theme_set,
+}
 
 
 async def theme_command(update: "telegram.Update", context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -165,101 +320,98 @@ async def theme_command(update: "telegram.Update", context: ContextTypes.DEFAULT
         await update.message.reply_text("Themed series is currently disabled by the admin.")
         return
 
-    chat_id = update.effective_chat.id
-    user_name = update.effective_user.first_name or "User"
     args = context.args or []
+    handler = _THEME_ACTIONS.get(args[0].lower() if args else None, _theme_unknown)
+    await handler(update, args)
 
-    if not args:
-        status = "subscribed" if themes.is_subscribed(chat_id) else "not subscribed"
-        _, current_theme = themes.get_current_theme()
-        await update.message.reply_text(
-            "Weekly Themed Series: "
-            f"You are currently {status}.\n"
-            "Use /theme on to subscribe or /theme off to unsubscribe.\n"
-            f"Current theme: {current_theme or 'TBD'}"
-        )
-        return
 
-    action = args[0].lower()
-    if action in {"on", "subscribe"}:
-        if themes.subscribe(chat_id):
-            await update.message.reply_text("Subscribed to Weekly Themed Series ✅")
-            logger.info(f"User {user_name} (ID: {chat_id}) subscribed to themes")
-        else:
-            await update.message.reply_text("You are already subscribed to themes.")
-        return
+def _llm(use_cache: bool = True) -> ChatGroq:
+    """
+    Return the shared Groq LLaMA-3 client.
 
-    if action in {"off", "unsubscribe"}:
-        if themes.unsubscribe(chat_id):
-            await update.message.reply_text("Unsubscribed from Weekly Themed Series ✅")
-            logger.info(f"User {user_name} (ID: {chat_id}) unsubscribed from themes")
-        else:
-            await update.message.reply_text("You were not subscribed to themes.")
-        return
+    Built once on first use so every call reuses the same underlying HTTP
+    connection pool (and warm TLS session) to api.groq.com. Pass
+    ``use_cache=False`` for a client that bypasses the global LLM cache.
+    """
+    # lru_cache keys _llm(), _llm(True) and _llm(use_cache=True) separately;
+    # normalise here so there is exactly one client per cache setting
+    return _build_llm(bool(use_cache))
+
+
+@lru_cache(maxsize=None)
+def _build_llm(use_cache: bool) -> ChatGroq:
+    return ChatGroq(
+        model="llama-3.1-8b-instant",
+        temperature=0.7,  # Slightly higher for more creative facts
+        max_tokens=150,   # Limit response length
+        max_retries=2,
+        timeout=30,
+        cache=None if use_cache else False,
+    )
 
-    if action == "status":
-        status = "subscribed" if themes.is_subscribed(chat_id) else "not subscribed"
-        wk, current_theme = themes.get_current_theme()
-        await update.message.reply_text(
-            f"You are {status}. Current week: {wk or 'TBD'}, Theme: {current_theme or 'TBD'}."
-        )
-        return
 
-    if action == "set":
-        # Optional admin override using comma-separated IDs in THEME_ADMIN_IDS
-        admin_ids_str = os.getenv("THEME_ADMIN_IDS", "").strip()
-        admin_ids = {int(x) for x in admin_ids_str.split(",") if x.strip().isdigit()} if admin_ids_str else set()
-        if chat_id not in admin_ids:
-            await update.message.reply_text("You are not authorized to set the theme.")
-            return
-        if len(args) < 2:
-            await update.message.reply_text("Usage: /theme set <theme name>")
-            return
-        manual_theme = " ".join(args[1:]).strip()
-        wk, th = themes.ensure_current_week_theme(admin_override=manual_theme)
-        await update.message.reply_text(f"Set weekly theme to '{th}' for week {wk} ✅")
-        logger.info(f"Admin {chat_id} set weekly theme to '{th}' for {wk}")
-        return
+def _response_text(response) -> str:
+    """Extract the text content from an LLM response."""
+    if hasattr(response, "content"):
+        return response.content.strip()
+    if isinstance(response, list) and response and hasattr(response[0], "content"):
+        return response[0].content.strip()
     
-    await update.message.reply_text("Unknown action. Use /theme on|off|status or /theme set <name>.")
+    # Fallback to string representation
+    return str(response).strip()
 
 
-def _generate_fact_sync() -> str:
+async def _generate_fact_async(use_cache: bool = True) -> str:
     """
     Generate an Ethiopian history fact using Groq's LLaMA-3 model.
     
-    This function runs synchronously in a thread to avoid blocking the asyncio loop.
-    Returns a formatted history fact string.
+    Awaits the HTTP call natively on the event loop instead of parking a
+    worker thread. Returns a formatted history fact string.
     """
     try:
-        # Initialize Groq LLM with LLaMA-3 model
-        llm = ChatGroq(
-            model="llama-3.1-8b-instant", 
-            temperature=0.7,  # Slightly higher for more creative facts
-            max_tokens=150    # Limit response length
-        )
-        
-        prompt = (
-            "Provide a fascinating and accurate Ethiopian history fact in 2-3 sentences. "
-            "Focus on interesting events, cultural aspects, or historical figures. "
-            "Make it engaging and educational."
-        )
-        
-        # Generate response using LangChain schema
-        response = llm.invoke([HumanMessage(content=prompt)])
-        
-        # Extract content from response
-        if hasattr(response, "content"):
-            return response.content.strip()
-        if isinstance(response, list) and response and hasattr(response[0], "content"):
-            return response[0].content.strip()
-        
-        # Fallback to string representation
-        return str(response).strip()
-        
+        response = await _llm(use_cache).ainvoke(_FACT_MSGS)
+        return _response_text(response)
     except Exception as e:
         logger.error(f"Error generating fact: {e}")
-        return "I apologize, but I'm having trouble generating a history fact right now. Please try again later."
+        return FACT_FALLBACK
+
+
+async def _stream_fact(message: "telegram.Message") -> str:
+    """
+    Stream a fact from Groq into an already-sent message.
+
+    A cached fact is returned straight away; otherwise the message is edited
+    as tokens arrive, at most once per STREAM_EDIT_INTERVAL to respect
+    Telegram's per-chat edit rate limit, and the result is cached.
+    Returns the complete fact; the caller makes the final edit.
+    """
+    loop = asyncio.get_running_loop()
+    fact = ""
+    last_edit = loop.time()
+    async for chunk in llm_cache.astream_cached(_llm(), _FACT_MSGS):
+        fact += chunk
+        if fact.strip() and loop.time() - last_edit >= STREAM_EDIT_INTERVAL:
+            try:
+                await message.edit_text(f"{_FACT_HEADER}{fact} ▌")
+            except TelegramError as e:
+                logger.debug(f"Skipped streaming edit: {e}")
+            last_edit = loop.time()
+    return fact.strip()
+
+
+async def _warm_fact_pool(pool: "asyncio.Queue[str]") -> None:
+    """
+    Keep a pool of pre-generated facts topped up for /fact.
+
+    Runs as a background task for the lifetime of the bot. Facts bypass the
+    LLM cache so the pool holds distinct facts; ``pool.put`` blocks once the
+    pool is full, so generation only resumes after facts are consumed.
+    """
+    while True:
+        fact = await _generate_fact_async(use_cache=False)
+        if fact != FACT_FALLBACK:
+            await pool.put(fact)
+        await asyncio.sleep(FACT_POOL_REFILL_INTERVAL)
 
 
 async def _send_daily_facts(app: "telegram.ext.Application") -> None:
@@ -267,8 +419,9 @@ async def _send_daily_facts(app: "telegram.ext.Application") -> None:
     Generate and send daily Ethiopian history facts to all subscribers.
     
     This function is called by the scheduler and runs on the asyncio loop.
+    Messages go out in rate-limited batches via broadcast.deliver_in_batches.
     """
-    subs = _load_subscribers()
+    subs = await _load_subscribers()
     if not subs:
         logger.info("No subscribers; skipping daily fact delivery")
         return
@@ -276,44 +429,46 @@ async def _send_daily_facts(app: "telegram.ext.Application") -> None:
     logger.info(f"Starting daily fact generation for {len(subs)} subscribers")
     
     try:
-        # For non-themed users, prepare a generic fact once
-        generic_fact: Optional[str] = None
+        # For non-themed users, prepare the generic message once
+        generic_text: Optional[str] = None
         
         # Prepare theme/day context if enabled
         wk = theme_name = None
         day_index = None
+        themed_chats: Set[int] = set()
         if themes.is_themes_enabled():
             wk, theme_name = themes.ensure_current_week_theme()
             day_index = themes.get_day_index_for_week()
+            if theme_name and day_index:
+                themed_chats = {chat_id for chat_id in subs if themes.is_subscribed(chat_id)}
 
-        successful_sends = 0
-        failed_sends = 0
-
-        for chat_id in subs:
+        # Generate the shared facts up front so every batch sends the same text
+        themed_fact: Optional[str] = None
+        if themed_chats:
             try:
-                if themes.is_themes_enabled() and themes.is_subscribed(chat_id) and theme_name and day_index:
-                    # Themed fact
-                    themed_fact = await asyncio.to_thread(themes.generate_themed_fact_sync, theme_name, day_index)
-                    await app.bot.send_message(
-                        chat_id=chat_id,
-                        text=(
-                            f"🌅 Weekly Theme: {theme_name}\n"
-                            f"Day {day_index}/7\n\n{themed_fact}"
-                        ),
-                    )
-                    themes.log_fact_for_chat(chat_id, wk, themed_fact)
-                else:
-                    # Generic fact
-                    if generic_fact is None:
-                        generic_fact = await asyncio.to_thread(_generate_fact_sync)
-                    await app.bot.send_message(
-                        chat_id=chat_id,
-                        text=f"🌅 **Daily Ethiopian History Fact**\n\n{generic_fact}\n\n🇪🇹 Have a great day!",
-                    )
-                successful_sends += 1
-            except Exception as e:
-                logger.warning(f"Failed to send daily fact to {chat_id}: {e}")
-                failed_sends += 1
+                themed_fact = await asyncio.to_thread(themes.generate_themed_fact_sync, theme_name, day_index)
+            except Exception:
+                logger.exception("Failed to generate themed fact; sending the generic fact instead")
+                themed_chats = set()
+        if len(themed_chats) < len(subs):
+            generic_fact = await _generate_fact_async()
+            generic_text = f"{_GENERIC_PREFIX}{generic_fact}{_GENERIC_SUFFIX}"
+
+        async def _deliver(chat_id: int) -> None:
+            if chat_id in themed_chats:
+                # Themed fact
+                await broadcast.send_one(
+                    app,
+                    chat_id,
+                    f"🌅 Weekly Theme: {theme_name}\n"
+                    f"Day {day_index}/7\n\n{themed_fact}",
+                )
+                themes.log_fact_for_chat(chat_id, wk, themed_fact)
+            else:
+                # Generic fact
+                await broadcast.send_one(app, chat_id, generic_text)
+
+        successful_sends, failed_sends = await broadcast.deliver_in_batches(subs, _deliver, "daily fact")
 
         logger.info(f"Daily fact delivery completed: {successful_sends} successful, {failed_sends} failed")
 
@@ -333,9 +488,13 @@ def _parse_daily_time(time_str: str) -> dtime:
         datetime.time object with parsed time, defaults to 09:00 if invalid
     """
     try:
-        parts = [int(p) for p in time_str.split(":", 1)]
-        hour, minute = parts[0], parts[1] if len(parts) > 1 else 0
-        parsed_time = dtime(hour=hour % 24, minute=minute % 60)
+        # Accept "9", "21" and "9:5" as before; fromisoformat needs "HH:MM".
+        # Only digits are allowed, so seconds and UTC offsets are rejected.
+        hour, _, minute = time_str.partition(":")
+        minute = minute or "0"
+        if not (hour.isdigit() and minute.isdigit()):
+            raise ValueError("expected H, HH, H:M or HH:MM")
+        parsed_time = dtime.fromisoformat(f"{hour.zfill(2)}:{minute.zfill(2)}")
         logger.info(f"Parsed daily send time: {parsed_time}")
         return parsed_time
     except Exception as e:
@@ -350,13 +509,21 @@ async def main() -> None:
     Initializes the Telegram bot, sets up the scheduler, and starts both services
     running on the same asyncio event loop.
     """
+    global _FACT_POOL
     logger.info("Starting Ethiopian History AI Bot...")
     
     # Validate environment variables
     _require_env_vars()
 
     # Build the Telegram bot application
-    app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+    # HTTP/2 lets concurrent broadcast sends multiplex over one warm connection
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .http_version("2")
+        .connection_pool_size(TELEGRAM_POOL_SIZE)
+        .build()
+    )
     logger.info("Telegram bot application created")
 
     # Register command handlers
@@ -366,7 +533,6 @@ async def main() -> None:
     app.add_handler(CommandHandler("theme", theme_command))
     app.add_handler(CommandHandler("quiz", quiz.quiz_command))
     app.add_handler(CallbackQueryHandler(quiz.quiz_callback))
-    app.add_handler(CommandHandler("quiz", quiz_command))
     logger.info("Command handlers registered")
 
     # Setup the scheduler (shares the same asyncio loop as the bot)
@@ -402,6 +568,10 @@ async def main() -> None:
     logger.info("Initializing Telegram bot...")
     await app.initialize()
     await app.start()
+
+    # Pre-generate facts in the background so /fact can answer instantly
+    _FACT_POOL = asyncio.Queue(maxsize=FACT_POOL_SIZE)
+    warm_task = asyncio.create_task(_warm_fact_pool(_FACT_POOL))
     
     try:
         logger.info("Starting bot polling...")
@@ -418,6 +588,7 @@ async def main() -> None:
     finally:
         # Graceful shutdown
         logger.info("Shutting down bot...")
+        warm_task.cancel()
         await app.updater.stop()
         await app.stop()
         await app.shutdown()
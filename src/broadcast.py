@@ -0,0 +1,58 @@
+"""
+Rate-limited message fan-out for scheduled broadcasts.
+
+Shared by the daily fact job and the weekly themed summaries so both stay
+under Telegram's global limit of roughly 30 messages/second.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Tuple
+
+from telegram.error import RetryAfter
+
+if TYPE_CHECKING:
+    import telegram.ext
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_SIZE = 25
+BATCH_INTERVAL = 1.0  # seconds between batches
+
+
+async def send_one(app: "telegram.ext.Application", chat_id: int, text: str) -> None:
+    """Send one message, retrying once if Telegram asks us to back off."""
+    try:
+        await app.bot.send_message(chat_id=chat_id, text=text)
+    except RetryAfter as exc:
+        logger.info("Rate limited while sending to %s; retrying in %ss", chat_id, exc.retry_after)
+        await asyncio.sleep(exc.retry_after)
+        await app.bot.send_message(chat_id=chat_id, text=text)
+
+
+async def deliver_in_batches(
+    chat_ids: Iterable[int],
+    deliver: Callable[[int], Awaitable[None]],
+    what: str,
+) -> Tuple[int, int]:
+    """
+    Await deliver(chat_id) for every chat in concurrent batches of BATCH_SIZE,
+    pausing BATCH_INTERVAL between batches. Failures are logged per chat.
+
+    Returns (successful, failed).
+    """
+    chat_ids = list(chat_ids)
+    successful = failed = 0
+    for start in range(0, len(chat_ids), BATCH_SIZE):
+        batch = chat_ids[start:start + BATCH_SIZE]
+        results = await asyncio.gather(*(deliver(chat_id) for chat_id in batch), return_exceptions=True)
+        for chat_id, result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to send %s to %s: %s", what, chat_id, result)
+                failed += 1
+            else:
+                successful += 1
+        if start + BATCH_SIZE < len(chat_ids):
+            await asyncio.sleep(BATCH_INTERVAL)
+    return successful, failed
@@ -1,23 +1,62 @@
 import os
 import sys
+import math
+import uuid
+import hashlib
+
+import faiss
+import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_community.embeddings import FastEmbedEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+# Product quantization: 16 sub-vectors x 8-bit codes per vector. Training a
+# 256-centroid codebook needs a few hundred vectors at least, so smaller
+# corpora keep an exact flat index.
+PQ_M = 16
+PQ_NBITS = 8
+PQ_MIN_VECTORS = 1024
+
+
 def _prepare_embeddings():
     # Lightweight local embeddings, no GPU/torch required
     model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
     return FastEmbedEmbeddings(model_name=model_name)
 
 
+def _build_index(vectors):
+    xb = np.asarray(vectors, dtype="float32")
+    n, d = xb.shape
+    if n < PQ_MIN_VECTORS or d % PQ_M:
+        index = faiss.IndexFlatL2(d)
+    else:
+        nlist = max(1, int(math.sqrt(n)))
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(d), d, nlist, PQ_M, PQ_NBITS)
+        index.train(xb)
+        index.nprobe = min(nlist, 8)
+        print(f"✅ Trained IVF-PQ index ({nlist} lists, {PQ_M}x{PQ_NBITS}-bit codes).")
+    index.add(xb)
+    return index
+
+
 def build_vector_db():
     print("📖 Loading documents...")
-    loader = DirectoryLoader("data", glob="*.txt", loader_cls=TextLoader)
+    # Files are independent reads, so load them concurrently
+    loader = DirectoryLoader(
+        "data",
+        glob="*.txt",
+        loader_cls=TextLoader,
+        use_multithreading=True,
+        max_concurrency=os.cpu_count() or 4,
+        silent_errors=True,
+    )
     documents = loader.load()
 
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
@@ -25,8 +64,33 @@ def build_vector_db():
 
     print(f"✅ Split into {len(texts)} chunks.")
 
+    # Drop exact duplicate chunks (repeated headers, citations) before embedding
+    seen = set()
+    unique = []
+    for t in texts:
+        h = hashlib.blake2b(t.page_content.encode("utf-8"), digest_size=16).digest()
+        if h not in seen:
+            seen.add(h)
+            unique.append(t)
+    if len(unique) < len(texts):
+        print(f"✅ Removed {len(texts) - len(unique)} duplicate chunks.")
+    texts = unique
+
     embeddings = _prepare_embeddings()
-    db = FAISS.from_documents(texts, embeddings)
+    # Embed all chunks in one call (FastEmbed batches internally), then build
+    # the index from the raw vectors so _build_index can choose its type
+    text_strs = [t.page_content for t in texts]
+    vectors = embeddings.embed_documents(text_strs)
+    ids = [str(uuid.uuid4()) for _ in texts]
+    db = FAISS(
+        embedding_function=embeddings,
+        index=_build_index(vectors),
+        docstore=InMemoryDocstore({
+            doc_id: Document(page_content=t.page_content, metadata=t.metadata)
+            for doc_id, t in zip(ids, texts)
+        }),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
     db.save_local("vectorstore")
 
     print("✅ Vector DB saved at ./vectorstore")
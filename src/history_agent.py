@@ -1,13 +1,35 @@
 import os
 import sys
+import pickle
+import asyncio
+
+import faiss
 from langchain_community.embeddings import FastEmbedEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_groq import ChatGroq
-from langchain.chains import RetrievalQA
+from langchain_core.prompts import PromptTemplate
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 from dotenv import load_dotenv
 
+import llm_cache
+
 load_dotenv()
 
+# Persistent exact-match cache: repeated questions (same retrieved context,
+# temperature 0) are answered from disk instead of calling Groq again.
+# Streamed answers go through it via llm_cache.astream_cached.
+set_llm_cache(SQLiteCache(database_path=os.getenv("LLM_CACHE_PATH", ".langchain.db")))
+
+VECTORSTORE_DIR = "vectorstore"
+
+# Same "stuff" prompt RetrievalQA uses by default
+QA_PROMPT = PromptTemplate.from_template(
+    "Use the following pieces of context to answer the question at the end. "
+    "If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\n"
+    "{context}\n\nQuestion: {question}\nHelpful Answer:"
+)
+
 
 def _require_api_key() -> None:
     key = os.getenv("GROQ_API_KEY", "").strip()
@@ -16,20 +38,66 @@ def _require_api_key() -> None:
         sys.exit(1)
 
 
+def _mmap_flags(index_path: str) -> int:
+    """Return the faiss read flags that memory-map the index stored at index_path."""
+    with open(index_path, "rb") as fh:
+        fourcc = fh.read(4)
+    # IO_FLAG_MMAP only maps IVF inverted lists ("Iw.." indexes); flat-code
+    # indexes such as IndexFlatL2 ("IxF2") need IO_FLAG_MMAP_IFC (in the pinned faiss-cpu 1.12)
+    if fourcc.startswith(b"Iw"):
+        return faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+    return faiss.IO_FLAG_MMAP_IFC
+
+
+def _load_vectorstore(embeddings) -> FAISS:
+    """Load the FAISS store with the index vectors memory-mapped rather than read into RAM."""
+    index_path = os.path.join(VECTORSTORE_DIR, "index.faiss")
+    try:
+        index = faiss.read_index(index_path, _mmap_flags(index_path))
+    except RuntimeError:
+        # Index types without mmap support are loaded the regular way
+        return FAISS.load_local(VECTORSTORE_DIR, embeddings, allow_dangerous_deserialization=True)
+    # Same sidecar FAISS.save_local writes: (docstore, index_to_docstore_id)
+    with open(os.path.join(VECTORSTORE_DIR, "index.pkl"), "rb") as fh:
+        docstore, index_to_docstore_id = pickle.load(fh)
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def _format_docs(docs) -> str:
+    return "\n\n".join(d.page_content for d in docs)
+
+
+async def _answer(retriever, llm: ChatGroq, query: str) -> None:
+    """Retrieve context for the question and stream the answer to stdout."""
+    docs = await retriever.ainvoke(query)
+    messages = QA_PROMPT.format_prompt(context=_format_docs(docs), question=query).to_messages()
+    async for chunk in llm_cache.astream_cached(llm, messages):
+        print(chunk, end="", flush=True)
+
+
 def run_agent():
     _require_api_key()
     embeddings = FastEmbedEmbeddings(model_name=os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5"))
-    db = FAISS.load_local("vectorstore", embeddings, allow_dangerous_deserialization=True)
+    db = _load_vectorstore(embeddings)
+    retriever = db.as_retriever()
 
-    llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
-    qa = RetrievalQA.from_chain_type(llm=llm, retriever=db.as_retriever())
+    llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0, streaming=True)
 
-    while True:
-        query = input("\n❓ Ask about Ethiopian history (or type 'exit'): ")
-        if query.lower() in ["exit", "quit"]:
-            break
-        answer = qa.run(query)
-        print(f"\n💡 {answer}\n")
+    # input() runs on the main thread so Ctrl-C/EOF end the session at once;
+    # one loop serves every question so the async Groq client stays usable.
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            query = input("\n❓ Ask about Ethiopian history (or type 'exit'): ")
+            if query.lower() in ["exit", "quit"]:
+                break
+            print("\n💡 ", end="", flush=True)
+            loop.run_until_complete(_answer(retriever, llm, query))
+            print("\n")
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        loop.close()
 
 if __name__ == "__main__":
     run_agent()
@@ -0,0 +1,194 @@
+"""
+Semantic LLM response cache.
+
+Persists LLM generations in SQLite keyed by an embedding of the prompt so that
+paraphrased prompts reuse a previous answer instead of calling Groq again.
+Install it process-wide with ``langchain.globals.set_llm_cache``.
+
+LangChain never consults the global cache for streamed calls;
+``astream_cached`` streams through it for callers that want both.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from array import array
+from math import sqrt
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import get_llm_cache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(__file__), "..", "cache", "facts.db")
+
+# Numbers and quoted phrases are the variable parts of our prompt templates
+# ("day 3", "'Historic Battles'"); they must match exactly, otherwise two
+# instances of the same template would look like paraphrases of each other.
+_SLOT_RE = re.compile(r"'[^']*'|\d+")
+
+
+def _prompt_text(prompt: str) -> str:
+    """Extract the message text from a serialized chat prompt, if possible."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    parts = [m.get("kwargs", {}).get("content", "") for m in messages if isinstance(m, dict)]
+    return "\n".join(p for p in parts if isinstance(p, str)) or prompt
+
+
+async def astream_cached(llm: BaseChatModel, messages: List[BaseMessage]) -> AsyncIterator[str]:
+    """Stream a chat model's answer, served from and saved to the global LLM cache.
+
+    Uses the same (prompt, llm_string) key as ``llm.invoke``, so streamed and
+    non-streamed calls share entries. A cache hit is yielded as one chunk.
+    """
+    # Honour the model's own cache setting the way invoke() does
+    if isinstance(llm.cache, BaseCache):
+        cache = llm.cache
+    else:
+        cache = None if llm.cache is False else get_llm_cache()
+    prompt, llm_string = dumps(messages), llm._get_llm_string()
+    cached = await cache.alookup(prompt, llm_string) if cache is not None else None
+    if cached:
+        yield cached[0].text
+        return
+    text = ""
+    async for chunk in llm.astream(messages):
+        text += chunk.content
+        yield chunk.content
+    if cache is not None and text.strip():
+        await cache.aupdate(prompt, llm_string, [ChatGeneration(message=AIMessage(content=text))])
+
+
+def _cosine(a: array, b: array) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = sqrt(sum(x * x for x in a)) * sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticLLMCache(BaseCache):
+    """LangChain cache matching prompts by embedding similarity."""
+
+    def __init__(
+        self,
+        database_path: Optional[str] = None,
+        threshold: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+        embedding_model: Optional[str] = None,
+    ) -> None:
+        # Environment is read here rather than at import so .env values apply
+        database_path = database_path or os.getenv("FACT_CACHE_PATH", DEFAULT_CACHE_FILE)
+        if threshold is None:
+            threshold = float(os.getenv("FACT_CACHE_THRESHOLD", "0.85"))
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("FACT_CACHE_TTL", "3600"))  # 0 disables expiry
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._model_name = embedding_model or os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+        self._embeddings = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self._conn = sqlite3.connect(database_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_llm_cache ("
+            " llm_string TEXT NOT NULL,"
+            " slots TEXT NOT NULL,"
+            " prompt TEXT NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_llm_cache_key"
+            " ON semantic_llm_cache (llm_string, slots)"
+        )
+        self._conn.commit()
+
+    def _embed(self, text: str) -> array:
+        if self._embeddings is None:
+            # Same local ONNX model used for the vector store; loaded on first use
+            from langchain_community.embeddings import FastEmbedEmbeddings
+
+            self._embeddings = FastEmbedEmbeddings(model_name=self._model_name)
+        return array("f", self._embeddings.embed_query(text))
+
+    def _key(self, prompt: str) -> Tuple[str, str]:
+        text = _prompt_text(prompt)
+        return text, "|".join(_SLOT_RE.findall(text))
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        text, slots = self._key(prompt)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, prompt, embedding, response FROM semantic_llm_cache"
+                " WHERE llm_string = ? AND slots = ? AND created_at >= ?"
+                " ORDER BY created_at DESC",
+                (llm_string, slots, time.time() - self.ttl_seconds if self.ttl_seconds else 0),
+            ).fetchall()
+            if not rows:
+                return None
+            # Exact repeats (the common case for our fixed prompts) skip embedding
+            best_response = next((response for _, cached, _, response in rows if cached == text), None)
+            if best_response is None:
+                query = self._embed(text)
+                best_score = 0.0
+                for rowid, cached, blob, response in rows:
+                    if blob:
+                        vector = array("f", blob)
+                    else:
+                        # Rows are stored unembedded; embed on the first paraphrase lookup
+                        vector = self._embed(cached)
+                        self._conn.execute(
+                            "UPDATE semantic_llm_cache SET embedding = ? WHERE rowid = ?",
+                            (vector.tobytes(), rowid),
+                        )
+                    score = _cosine(query, vector)
+                    if score > best_score:
+                        best_score, best_response = score, response
+                self._conn.commit()
+                if best_score < self.threshold:
+                    return None
+                logger.debug("Semantic cache hit (similarity %.3f)", best_score)
+
+        try:
+            return loads(best_response)
+        except Exception:
+            logger.warning("Failed to deserialize cached generation; treating as plain text")
+            return [Generation(text=best_response)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        text, slots = self._key(prompt)
+        with self._lock:
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM semantic_llm_cache"
+                    " WHERE llm_string = ? AND slots = ? AND created_at < ?",
+                    (llm_string, slots, time.time() - self.ttl_seconds),
+                )
+            self._conn.execute(
+                "INSERT INTO semantic_llm_cache (llm_string, slots, prompt, embedding, response, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                # Empty embedding: filled in by lookup() only if a paraphrase needs it
+                (llm_string, slots, text, b"", dumps(list(return_val)), time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM semantic_llm_cache")
+            self._conn.commit()
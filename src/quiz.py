@@ -7,7 +7,6 @@ and responds with correctness feedback.
 
 import logging
 import random
-from typing import Dict
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
@@ -16,28 +15,36 @@ from .quiz_data import QUIZ_QUESTIONS
 
 logger = logging.getLogger(__name__)
 
+_RNG = random.Random()
 
-def _build_keyboard(options):
+
+def _build_keyboard(qid, options):
+    # "q|<question index>|<option index>": a few bytes, well under Telegram's
+    # 64-byte callback_data limit, and the answer never reaches the client
     return InlineKeyboardMarkup([
-        [InlineKeyboardButton(text=opt, callback_data=f"quiz|{opt}")]
-        for opt in options
+        [InlineKeyboardButton(text=opt, callback_data=f"q|{qid}|{i}")]
+        for i, opt in enumerate(options)
     ])
 
 
+# Questions are static, so build each (question, keyboard) once at import
+_PRECOMPUTED = [
+    (q.question, _build_keyboard(qid, q.options))
+    for qid, q in enumerate(QUIZ_QUESTIONS)
+]
+
+
 async def quiz_command(update: "Update", context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a random quiz question with multiple-choice buttons."""
     if not QUIZ_QUESTIONS:
         await update.message.reply_text("No quiz questions available right now.")
         return
 
-    q = random.choice(QUIZ_QUESTIONS)
-
-    # Store the correct answer in user_data keyed by chat id for this interaction
-    context.user_data["quiz_correct_answer"] = q["answer"]
+    question, markup = _PRECOMPUTED[_RNG.randrange(len(_PRECOMPUTED))]
 
     await update.message.reply_text(
-        text=q["question"],
-        reply_markup=_build_keyboard(q["options"]),
+        text=question,
+        reply_markup=markup,
     )
 
 
@@ -46,94 +53,19 @@ async def quiz_callback(update: "Update", context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
 
-    data = query.data or ""
-    prefix, _, chosen = data.partition("|")
-    if prefix != "quiz":
+    # Each button names its own question, so older quiz messages stay answerable
+    prefix, _, rest = (query.data or "").partition("|")
+    if prefix != "q":
         return
-
-    correct = context.user_data.get("quiz_correct_answer")
-    if not correct:
+    qid, _, idx = rest.partition("|")
+    try:
+        q = QUIZ_QUESTIONS[int(qid)]
+        chosen = q.options[int(idx)]
+    except (ValueError, IndexError):
         await query.edit_message_text("Quiz session expired. Use /quiz to try again.")
         return
 
-    if chosen == correct:
+    if chosen == q.answer:
         await query.edit_message_text("✅ Correct!")
     else:
-        await query.edit_message_text(f"❌ Incorrect. The correct answer is {correct}.")
-
-    # Clear stored answer
-    context.user_data.pop("quiz_correct_answer", None)
-
-"""
-Random History Quiz utilities for the Ethiopian History AI Bot.
-
-Provides a /quiz command that sends one multiple-choice question using
-InlineKeyboardMarkup and handles user responses via callback queries.
-"""
-
-import json
-import logging
-import random
-from typing import Dict
-
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.ext import ContextTypes
-
-from .quiz_data import QUIZ_QUESTIONS
-
-
-logger = logging.getLogger(__name__)
-
-
-def _build_question_payload(q: Dict) -> str:
-    payload = {
-        "q": q["question"],
-        "a": q["answer"],
-    }
-    return json.dumps(payload, ensure_ascii=False)
-
-
-def build_quiz_message() -> Dict:
-    """Pick a random question and return dict with text and keyboard."""
-    q = random.choice(QUIZ_QUESTIONS)
-    options = q["options"][:]
-    random.shuffle(options)
-
-    # Use callback_data as JSON with the correct answer and question text
-    # For each option, embed the user's chosen text to compare server-side
-    keyboard = [
-        [InlineKeyboardButton(text=opt, callback_data=_build_option_data(q, opt))]
-        for opt in options
-    ]
-    markup = InlineKeyboardMarkup(keyboard)
-    return {"text": q["question"], "reply_markup": markup}
-
-
-def _build_option_data(q: Dict, chosen: str) -> str:
-    payload = {
-        "answer": q["answer"],
-        "chosen": chosen,
-    }
-    return json.dumps(payload, ensure_ascii=False)
-
-
-async def handle_quiz_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle callback query for a quiz answer selection."""
-    if not update.callback_query:
-        return
-    query = update.callback_query
-    try:
-        data = json.loads(query.data)
-        answer = data.get("answer")
-        chosen = data.get("chosen")
-        if chosen == answer:
-            text = "✅ Correct!"
-        else:
-            text = f"❌ Incorrect. The correct answer is {answer}."
-        await query.answer()
-        await query.edit_message_text(text)
-    except Exception:
-        logger.exception("Failed to process quiz selection")
-        await query.answer(text="Error processing your selection.")
-
-
+        await query.edit_message_text(f"❌ Incorrect. The correct answer is {q.answer}.")
@@ -1,70 +1,47 @@
-"""Sample Ethiopian history quiz questions."""
-
-from typing import List, Dict
-
-QUIZ_QUESTIONS: List[Dict[str, object]] = [
-    {
-        "question": "Which empire was the first in the region to adopt Christianity as a state religion?",
-        "options": ["Aksum", "Zulu Kingdom", "Mali Empire", "Axumite Kingdom"],
-        "answer": "Aksum",
-    },
-    {
-        "question": "Which script is traditionally used to write many Ethiopian languages?",
-        "options": ["Ge'ez", "Latin", "Arabic", "Cyrillic"],
-        "answer": "Ge'ez",
-    },
-    {
-        "question": "Which battle in 1896 is celebrated for Ethiopia's victory against a European power?",
-        "options": ["Battle of Adwa", "Battle of Omdurman", "Battle of Isandlwana", "Battle of Khartoum"],
-        "answer": "Battle of Adwa",
-    },
-    {
-        "question": "Who was the Ethiopian emperor crowned in 1930 known as the 'Conquering Lion of Judah'?",
-        "options": ["Haile Selassie I", "Menelik II", "Yohannes IV", "Tewodros II"],
-        "answer": "Haile Selassie I",
-    },
-    {
-        "question": "The ancient city of Aksum is located in which modern region of Ethiopia?",
-        "options": ["Tigray", "Oromia", "Amhara", "Afar"],
-        "answer": "Tigray",
-    },
-]
-
 """
 Sample Ethiopian history quiz questions.
 
 Keep it small and simple. No persistence or scoring.
 """
 
-from typing import List, Dict
-
-
-QUIZ_QUESTIONS: List[Dict] = [
-    {
-        "question": "Which empire was the first in the region to adopt Christianity as a state religion?",
-        "options": ["Aksum", "Zulu Kingdom", "Mali Empire", "Axumite Kingdom"],
-        "answer": "Aksum",
-    },
-    {
-        "question": "Which ancient Ethiopian kingdom minted its own coins and was a major trade power?",
-        "options": ["Aksum", "Gondar", "Harar", "Shewa"],
-        "answer": "Aksum",
-    },
-    {
-        "question": "Which battle in 1896 preserved Ethiopia's independence against colonial forces?",
-        "options": ["Battle of Adwa", "Battle of Omdurman", "Battle of Isandlwana", "Battle of Gondar"],
-        "answer": "Battle of Adwa",
-    },
-    {
-        "question": "Who was the Ethiopian emperor widely known internationally in the 20th century?",
-        "options": ["Haile Selassie", "Menelik II", "Tewodros II", "Yohannes IV"],
-        "answer": "Haile Selassie",
-    },
-    {
-        "question": "The ancient stelae fields are a hallmark of which Ethiopian city?",
-        "options": ["Axum", "Lalibela", "Gondar", "Dire Dawa"],
-        "answer": "Axum",
-    },
+import sys
+from collections import namedtuple
+from typing import Tuple
+
+
+Question = namedtuple("Question", "question options answer")
+
+# (question, options, answer); frozen into immutable Question tuples below,
+# with option/answer strings interned since names like "Aksum" repeat
+_RAW_QUESTIONS = [
+    (
+        "Which empire was the first in the region to adopt Christianity as a state religion?",
+        ("Aksum", "Zulu Kingdom", "Mali Empire", "Axumite Kingdom"),
+        "Aksum",
+    ),
+    (
+        "Which ancient Ethiopian kingdom minted its own coins and was a major trade power?",
+        ("Aksum", "Gondar", "Harar", "Shewa"),
+        "Aksum",
+    ),
+    (
+        "Which battle in 1896 preserved Ethiopia's independence against colonial forces?",
+        ("Battle of Adwa", "Battle of Omdurman", "Battle of Isandlwana", "Battle of Gondar"),
+        "Battle of Adwa",
+    ),
+    (
+        "Who was the Ethiopian emperor widely known internationally in the 20th century?",
+        ("Haile Selassie", "Menelik II", "Tewodros II", "Yohannes IV"),
+        "Haile Selassie",
+    ),
+    (
+        "The ancient stelae fields are a hallmark of which Ethiopian city?",
+        ("Axum", "Lalibela", "Gondar", "Dire Dawa"),
+        "Axum",
+    ),
 ]
 
-
+QUIZ_QUESTIONS: Tuple[Question, ...] = tuple(
+    Question(q, tuple(sys.intern(o) for o in opts), sys.intern(a))
+    for q, opts, a in _RAW_QUESTIONS
+)
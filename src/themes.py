@@ -6,18 +6,40 @@ daily themed fact generation, and weekly summary compilation.
 """
 
 import os
-import json
+import random
+import asyncio
 import logging
+import threading
+from functools import lru_cache
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    import json
+
+    orjson = None
+
+import broadcast
+
+if TYPE_CHECKING:
+    from langchain.schema import HumanMessage
+    from langchain_groq import ChatGroq
 
 logger = logging.getLogger(__name__)
 
+_RNG = random.Random()
+
 
 THEMES_FILE = os.path.join(os.path.dirname(__file__), "..", "themes.json")
+# Mutations are appended here and folded into THEMES_FILE once it grows large
+THEMES_JOURNAL = THEMES_FILE + ".log"
+JOURNAL_COMPACT_BYTES = 64 * 1024
+SUMMARY_CONCURRENCY = 8  # weekly summaries compiled at once
+# Decoded state, reused until the snapshot or journal changes on disk
+_STATE_CACHE: Dict = {"stamp": None, "data": None}
+_STATE_LOCK = threading.RLock()
 DEFAULT_THEMES: List[str] = [
     "Ancient Kingdoms of Ethiopia",
     "Influential Leaders",
@@ -29,73 +51,193 @@ DEFAULT_THEMES: List[str] = [
 ]
 
 
+@lru_cache(maxsize=1)
 def is_themes_enabled() -> bool:
+    # ENABLE_THEMES is read once per process; restart the bot after changing it
     return os.getenv("ENABLE_THEMES", "false").strip().lower() in {"1", "true", "yes", "on"}
 
 
-def _week_key(d: Optional[date] = None) -> str:
-    d = d or date.today()
+@lru_cache(maxsize=8)
+def _week_key_of(d: date) -> str:
     iso_year, iso_week, _ = d.isocalendar()
     return f"{iso_year}-{iso_week:02d}"
 
 
-def _load_state() -> Dict:
+def _week_key(d: Optional[date] = None) -> str:
+    return _week_key_of(d or date.today())
+
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    if orjson:
+        # OPT_NON_STR_KEYS writes int chat_id keys as strings, like json does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _empty_state() -> Dict:
+    return {
+        "subscribers": set(),
+        "current_week_key": "",
+        "current_theme": "",
+        "facts_log": {},  # week_key -> chat_id -> [facts]
+        "journal_gen": 0,  # journal events tagged below this are in the snapshot
+    }
+
+
+def _file_stamp() -> Tuple[Optional[int], int]:
+    """Return (snapshot mtime_ns, journal size); identifies the on-disk state."""
     try:
-        if not os.path.exists(THEMES_FILE):
-            return {
-                "subscribers": [],
-                "current_week_key": "",
-                "current_theme": "",
-                "facts_log": {},  # week_key -> chat_id -> [facts]
-            }
-        with open(THEMES_FILE, "r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except Exception:
-        logger.exception("Failed to load themes.json; using default empty state")
-        return {
-            "subscribers": [],
-            "current_week_key": "",
-            "current_theme": "",
-            "facts_log": {},
-        }
+        mtime_ns: Optional[int] = os.stat(THEMES_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    try:
+        journal_size = os.stat(THEMES_JOURNAL).st_size
+    except FileNotFoundError:
+        journal_size = 0
+    return mtime_ns, journal_size
+
+
+def _apply_event(state: Dict, event: Dict) -> None:
+    op = event.get("op")
+    chat_id = event.get("chat_id")
+    subs: Set[int] = state["subscribers"]
+    if op == "sub":
+        subs.add(chat_id)
+    elif op == "unsub":
+        subs.discard(chat_id)
+    elif op == "fact":
+        wk_log = state.setdefault("facts_log", {}).setdefault(event["week"], {})
+        wk_log.setdefault(chat_id, []).append(event["fact"])
+
+
+def _load_state() -> Dict:
+    """Return the themes state: the themes.json snapshot with the journal replayed.
+
+    The result is cached and only rebuilt when either file changes on disk.
+    The returned dict is the cached object itself; callers that modify it must
+    persist the change with _append_event or _save_state.
+    """
+    with _STATE_LOCK:
+        try:
+            stamp = _file_stamp()
+            if _STATE_CACHE["data"] is not None and _STATE_CACHE["stamp"] == stamp:
+                return _STATE_CACHE["data"]
+            state = _empty_state()
+            if stamp[0] is not None:
+                with open(THEMES_FILE, "rb") as fh:
+                    state = _json_loads(fh.read())
+                # Held as a set in memory for O(1) membership checks
+                state["subscribers"] = set(state.get("subscribers", []))
+                # JSON object keys are strings; chat ids are ints in memory
+                state["facts_log"] = {
+                    wk: {int(chat_id): facts for chat_id, facts in wk_log.items()}
+                    for wk, wk_log in state.get("facts_log", {}).items()
+                }
+            if stamp[1]:
+                gen = state.get("journal_gen", 0)
+                with open(THEMES_JOURNAL, "rb") as fh:
+                    for line in fh:
+                        try:
+                            event = _json_loads(line)
+                        except ValueError:
+                            # A torn final line from a crash mid-append
+                            logger.warning("Skipping malformed themes journal entry")
+                            continue
+                        # Events from an older generation are already in the snapshot
+                        # (a crash between os.replace and removing the journal)
+                        if event.get("gen", 0) >= gen:
+                            _apply_event(state, event)
+            _STATE_CACHE.update(stamp=stamp, data=state)
+            return state
+        except Exception:
+            logger.exception("Failed to load themes.json; using default empty state")
+            return _empty_state()
 
 
 def _save_state(state: Dict) -> None:
-    try:
-        os.makedirs(os.path.dirname(THEMES_FILE), exist_ok=True)
-        with open(THEMES_FILE, "w", encoding="utf-8") as fh:
-            json.dump(state, fh, indent=2)
-    except Exception:
-        logger.exception("Failed to save themes.json")
+    """Write a full snapshot of the state and truncate the journal it supersedes.
+
+    The snapshot is written to a temp file, fsynced, and moved into place with
+    os.replace, so a crash mid-write never leaves a truncated themes.json.
+    It also bumps journal_gen, so journal events it already contains are
+    skipped on replay if the journal outlives it.
+    """
+    with _STATE_LOCK:
+        try:
+            os.makedirs(os.path.dirname(THEMES_FILE), exist_ok=True)
+            tmp_path = THEMES_FILE + ".tmp"
+            gen = state.get("journal_gen", 0) + 1
+            with open(tmp_path, "wb") as fh:
+                # Sets aren't JSON; store subscribers as a sorted list for stable diffs
+                snapshot = {**state, "subscribers": sorted(state["subscribers"]), "journal_gen": gen}
+                fh.write(_json_dumps(snapshot, indent=True))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, THEMES_FILE)
+            state["journal_gen"] = gen
+            if os.path.exists(THEMES_JOURNAL):
+                os.remove(THEMES_JOURNAL)
+            _STATE_CACHE.update(stamp=_file_stamp(), data=state)
+        except Exception:
+            _STATE_CACHE.update(stamp=None, data=None)
+            logger.exception("Failed to save themes.json")
+
+
+def _append_event(state: Dict, event: Dict) -> None:
+    """Apply a mutation to the cached state and append it to the journal.
+
+    Costs one small append instead of rewriting themes.json; the journal is
+    folded into a fresh snapshot once it grows past JOURNAL_COMPACT_BYTES.
+    """
+    with _STATE_LOCK:
+        _apply_event(state, event)
+        event["gen"] = state.get("journal_gen", 0)
+        try:
+            os.makedirs(os.path.dirname(THEMES_JOURNAL), exist_ok=True)
+            with open(THEMES_JOURNAL, "ab") as fh:
+                fh.write(_json_dumps(event) + b"\n")
+            _STATE_CACHE.update(stamp=_file_stamp(), data=state)
+        except Exception:
+            _STATE_CACHE.update(stamp=None, data=None)
+            logger.exception("Failed to append to themes journal")
+            return
+        _maybe_compact(state)
+
+
+def _maybe_compact(state: Dict) -> None:
+    if _STATE_CACHE["stamp"] and _STATE_CACHE["stamp"][1] > JOURNAL_COMPACT_BYTES:
+        _save_state(state)
+        logger.info("Compacted themes journal into themes.json")
 
 
 def subscribe(chat_id: int) -> bool:
-    state = _load_state()
-    subs: List[int] = state.get("subscribers", [])
-    if chat_id in subs:
-        return False
-    subs.append(chat_id)
-    state["subscribers"] = subs
-    _save_state(state)
+    with _STATE_LOCK:
+        state = _load_state()
+        if chat_id in state["subscribers"]:
+            return False
+        _append_event(state, {"op": "sub", "chat_id": chat_id})
     logger.info("Subscribed chat %s to weekly themes", chat_id)
     return True
 
 
 def unsubscribe(chat_id: int) -> bool:
-    state = _load_state()
-    subs: List[int] = state.get("subscribers", [])
-    if chat_id not in subs:
-        return False
-    subs.remove(chat_id)
-    state["subscribers"] = subs
-    _save_state(state)
+    with _STATE_LOCK:
+        state = _load_state()
+        if chat_id not in state["subscribers"]:
+            return False
+        _append_event(state, {"op": "unsub", "chat_id": chat_id})
     logger.info("Unsubscribed chat %s from weekly themes", chat_id)
     return True
 
 
 def is_subscribed(chat_id: int) -> bool:
     state = _load_state()
-    return chat_id in state.get("subscribers", [])
+    return chat_id in state["subscribers"]
 
 
 def ensure_current_week_theme(admin_override: Optional[str] = None) -> Tuple[str, str]:
@@ -122,9 +264,7 @@ def get_current_theme() -> Tuple[str, str]:
 
 
 def _pick_random_theme() -> str:
-    import random
-
-    return random.choice(DEFAULT_THEMES)
+    return DEFAULT_THEMES[_RNG.randrange(len(DEFAULT_THEMES))]
 
 
 def get_day_index_for_week(d: Optional[date] = None) -> int:
@@ -133,17 +273,43 @@ def get_day_index_for_week(d: Optional[date] = None) -> int:
     return d.isoweekday()
 
 
-def generate_themed_fact_sync(theme: str, day_index: int) -> str:
-    """
-    Generate a themed fact using Groq's LLaMA-3 via LangChain.
-    """
-    llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.6, max_tokens=180)
+@lru_cache(maxsize=1)
+def _llm_fact() -> "ChatGroq":
+    """Shared client for themed facts; created on first use, then reused."""
+    # Imported lazily so deployments with themes disabled never load LangChain here
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(model="llama-3.1-8b-instant", temperature=0.6, max_tokens=180)
+
+
+@lru_cache(maxsize=1)
+def _llm_summary() -> "ChatGroq":
+    """Shared client for weekly summaries; created on first use, then reused."""
+    from langchain_groq import ChatGroq
+
+    # Bypasses the bot's semantic cache: summary prompts carry each chat's own
+    # facts, so a "similar" prompt must never reuse another chat's summary.
+    # _cached_summary already memoizes exact repeats.
+    return ChatGroq(model="llama-3.1-8b-instant", temperature=0.3, max_tokens=220, cache=False)
+
+
+@lru_cache(maxsize=64)
+def _themed_fact_messages(theme: str, day_index: int) -> List["HumanMessage"]:
+    from langchain.schema import HumanMessage
+
     prompt = (
         f"You are creating a 7-day mini-series about '{theme}'. "
         f"Today is day {day_index}. Provide a concise, engaging fact (2-3 sentences) that fits in the series. "
         f"Avoid repeating previous days and keep it historically accurate."
     )
-    resp = llm.invoke([HumanMessage(content=prompt)])
+    return [HumanMessage(content=prompt)]
+
+
+def generate_themed_fact_sync(theme: str, day_index: int) -> str:
+    """
+    Generate a themed fact using Groq's LLaMA-3 via LangChain.
+    """
+    resp = _llm_fact().invoke(_themed_fact_messages(theme, day_index))
     if hasattr(resp, "content"):
         return resp.content.strip()
     if isinstance(resp, list) and resp and hasattr(resp[0], "content"):
@@ -152,69 +318,93 @@ def generate_themed_fact_sync(theme: str, day_index: int) -> str:
 
 
 def log_fact_for_chat(chat_id: int, week_key: str, fact: str) -> None:
-    state = _load_state()
-    facts_log: Dict[str, Dict[str, List[str]]] = state.setdefault("facts_log", {})
-    wk_log = facts_log.setdefault(week_key, {})
-    chat_log = wk_log.setdefault(str(chat_id), [])
-    chat_log.append(fact)
-    _save_state(state)
+    with _STATE_LOCK:
+        _append_event(_load_state(), {"op": "fact", "chat_id": chat_id, "week": week_key, "fact": fact})
+
+
+@lru_cache(maxsize=128)
+def _cached_summary(theme: str, joined: str) -> str:
+    """LLM summary for a theme and its pre-joined facts; memoized, failures propagate uncached."""
+    from langchain.schema import HumanMessage
+
+    prompt = (
+        f"Summarize this 7-day themed series about '{theme}' into 1-2 cohesive paragraphs. "
+        f"Highlight key takeaways and weave a narrative.\n\nFacts:\n- {joined}"
+    )
+    resp = _llm_summary().invoke([HumanMessage(content=prompt)])
+    if hasattr(resp, "content"):
+        return resp.content.strip()
+    if isinstance(resp, list) and resp and hasattr(resp[0], "content"):
+        return resp[0].content.strip()
+    return str(resp).strip()
 
 
 def compile_weekly_summary_sync(theme: str, facts: List[str]) -> str:
     """
     Compile a 1-2 paragraph summary for the week's theme using prior facts.
     Uses LLM for a cohesive summary if possible; falls back to join.
+    Subscribers with identical facts share one cached LLM summary.
     """
+    # Joined once; serves as the prompt body, the cache key, and the fallback text
+    joined = "\n- ".join(facts)
     try:
-        llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.3, max_tokens=220)
-        joined = "\n- ".join(facts)
-        prompt = (
-            f"Summarize this 7-day themed series about '{theme}' into 1-2 cohesive paragraphs. "
-            f"Highlight key takeaways and weave a narrative.\n\nFacts:\n- {joined}"
-        )
-        resp = llm.invoke([HumanMessage(content=prompt)])
-        if hasattr(resp, "content"):
-            return resp.content.strip()
-        if isinstance(resp, list) and resp and hasattr(resp[0], "content"):
-            return resp[0].content.strip()
-        return str(resp).strip()
+        return _cached_summary(theme, joined)
     except Exception:
         logger.exception("Failed to compile weekly summary via LLM; falling back to simple summary")
-        return (
-            f"Weekly Summary for '{theme}':\n\n" + "\n".join(f"- {f}" for f in facts)
-        )
+        return f"Weekly Summary for '{theme}':\n\n- {joined}"
 
 
 async def send_weekly_summaries(app: "telegram.ext.Application") -> None:
     if not is_themes_enabled():
         return
     state = _load_state()
-    wk, theme = get_current_theme()
+    subs: Set[int] = state["subscribers"]
+    if not subs:
+        logger.info("No theme subscribers; skipping weekly summaries")
+        return
+    wk, theme = state.get("current_week_key", ""), state.get("current_theme", "")
     if not wk or not theme:
         logger.info("No current theme/week; skipping weekly summaries")
         return
-    subs: List[int] = state.get("subscribers", [])
-    facts_log: Dict[str, Dict[str, List[str]]] = state.get("facts_log", {})
+    facts_log: Dict[str, Dict[int, List[str]]] = state.get("facts_log", {})
     wk_log = facts_log.get(wk, {})
+    if not wk_log:
+        logger.info("No themed facts logged for week %s; skipping weekly summaries", wk)
+        return
 
     logger.info("Sending weekly themed summaries to %d subscribers", len(subs))
+    # Chats that logged identical facts share one summary. Group them first so
+    # each distinct fact list is compiled once; concurrent lru_cache misses
+    # would otherwise all call Groq before the first result is cached.
+    groups: Dict[Tuple[str, ...], List[int]] = {}
     for chat_id in subs:
-        facts = wk_log.get(str(chat_id), [])
-        if not facts:
-            continue
-        summary = await _to_thread_compile(theme, facts)
-        try:
-            await app.bot.send_message(
-                chat_id=chat_id,
-                text=f"🧭 Weekly Summary: {theme}\n\n{summary}"
-            )
-        except Exception:
-            logger.exception("Failed to send weekly summary to %s", chat_id)
+        facts = wk_log.get(chat_id)
+        if facts:
+            groups.setdefault(tuple(facts), []).append(chat_id)
 
+    # Compile concurrently, bounded to stay within Groq's rate limits
+    sem = asyncio.Semaphore(SUMMARY_CONCURRENCY)
 
-async def _to_thread_compile(theme: str, facts: List[str]) -> str:
-    import asyncio
+    async def _compile(facts: Tuple[str, ...]) -> str:
+        async with sem:
+            return await _to_thread_compile(theme, list(facts))
 
+    summaries = await asyncio.gather(*(_compile(facts) for facts in groups))
+    summary_for = {
+        chat_id: summary
+        for chat_ids, summary in zip(groups.values(), summaries)
+        for chat_id in chat_ids
+    }
+
+    async def _send(chat_id: int) -> None:
+        await broadcast.send_one(app, chat_id, f"🧭 Weekly Summary: {theme}\n\n{summary_for[chat_id]}")
+
+    # Sends share the daily broadcast's pacing and RetryAfter handling
+    sent, failed = await broadcast.deliver_in_batches(summary_for, _send, "weekly summary")
+    logger.info("Weekly summaries delivered: %d successful, %d failed", sent, failed)
+
+
+async def _to_thread_compile(theme: str, facts: List[str]) -> str:
     return await asyncio.to_thread(compile_weekly_summary_sync, theme, facts)
 
 